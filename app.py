@@ -1,5 +1,5 @@
 import streamlit as st
-from auth import auth_page, check_authentication, show_auth_sidebar, get_current_user_name
+from auth import auth_page, check_authentication, show_auth_sidebar, get_current_user
 from tasks import tasks_page
 from reports import reports_page
 from attendance import attendance_page
@@ -14,7 +14,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         padding: 1rem 0;
@@ -51,7 +51,54 @@ st.markdown("""
         background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# st.html injects the style block directly, without a markdown parse per rerun
+st.html(CUSTOM_CSS)
+
+# Feature overview columns for the landing page, as ready-made HTML
+FEATURES_HTML = (
+    """
+    <h3>📝 Task Management</h3>
+    <ul>
+        <li>Create, edit, and organize tasks</li>
+        <li>Set priorities and due dates</li>
+        <li>Track progress with status updates</li>
+        <li>Categorize tasks for better organization</li>
+    </ul>
+    """,
+    """
+    <h3>📊 Analytics &amp; Reports</h3>
+    <ul>
+        <li>View productivity metrics</li>
+        <li>Generate detailed reports</li>
+        <li>Export data to Excel</li>
+        <li>Track completion rates</li>
+    </ul>
+    """,
+    """
+    <h3>🔐 Secure &amp; Personal</h3>
+    <ul>
+        <li>Secure user authentication</li>
+        <li>Personal task management</li>
+        <li>Data privacy protection</li>
+        <li>Session management</li>
+    </ul>
+    """
+)
+
+# Page keys mapped to their navigation labels
+PAGE_LABELS = {
+    "Dashboard": "🏠 Dashboard",
+    "Tasks": "📝 Tasks",
+    "Attendance": "🕐 Attendance",
+    "Reports": "📊 Reports"
+}
+
+@st.cache_resource(show_spinner=False)
+def initialize_database():
+    """Create or migrate the database schema once per server process."""
+    init_db()
 
 def initialize_session_state():
     """Initialize session state variables."""
@@ -61,18 +108,55 @@ def initialize_session_state():
     if 'current_page' not in st.session_state:
         st.session_state.current_page = "Tasks"
     
-    if 'user_id' not in st.session_state:
-        st.session_state.user_id = None
+    if 'user_record' not in st.session_state:
+        st.session_state.user_record = None
+
+def navigate_to(page: str):
+    """Switch to the given page."""
+    st.session_state.current_page = page
+
+def show_dashboard_overview(user_id: int):
+    """Display quick stats."""
+    from tasks import load_task_statistics
+    
+    stats = load_task_statistics(user_id)
+    
+    st.subheader("📊 Quick Overview")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("📝 Total Tasks", stats['total'])
+    
+    with col2:
+        st.metric("⏳ Pending", stats['pending'])
+    
+    with col3:
+        st.metric("🔄 In Progress", stats['in_progress'])
+    
+    with col4:
+        st.metric("✅ Completed", stats['completed'])
+
+def show_quick_actions():
+    """Display quick navigation buttons."""
+    st.subheader("🚀 Quick Actions")
+    col1, col2, col3 = st.columns(3)
+    
+    # Buttons switch the page in their callback, so the click's own rerun
+    # already renders the target page
+    with col1:
+        st.button("➕ Add New Task", use_container_width=True,
+                  on_click=navigate_to, args=("Tasks",))
     
-    if 'user_name' not in st.session_state:
-        st.session_state.user_name = None
+    with col2:
+        st.button("📋 View All Tasks", use_container_width=True,
+                  on_click=navigate_to, args=("Tasks",))
     
-    if 'user_email' not in st.session_state:
-        st.session_state.user_email = None
+    with col3:
+        st.button("📊 View Reports", use_container_width=True,
+                  on_click=navigate_to, args=("Reports",))
 
 def show_welcome_dashboard():
     """Display welcome dashboard with quick stats."""
-    from database import get_task_statistics
     from auth import get_current_user_id
     
     st.markdown("""
@@ -84,41 +168,8 @@ def show_welcome_dashboard():
     
     user_id = get_current_user_id()
     if user_id:
-        stats = get_task_statistics(user_id)
-        
-        st.subheader("📊 Quick Overview")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("📝 Total Tasks", stats['total'])
-        
-        with col2:
-            st.metric("⏳ Pending", stats['pending'])
-        
-        with col3:
-            st.metric("🔄 In Progress", stats['in_progress'])
-        
-        with col4:
-            st.metric("✅ Completed", stats['completed'])
-        
-        # Quick action buttons
-        st.subheader("🚀 Quick Actions")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            if st.button("➕ Add New Task", use_container_width=True):
-                st.session_state.current_page = "Tasks"
-                st.rerun()
-        
-        with col2:
-            if st.button("📋 View All Tasks", use_container_width=True):
-                st.session_state.current_page = "Tasks"
-                st.rerun()
-        
-        with col3:
-            if st.button("📊 View Reports", use_container_width=True):
-                st.session_state.current_page = "Reports"
-                st.rerun()
+        show_dashboard_overview(user_id)
+        show_quick_actions()
 
 def show_sidebar_navigation():
     """Show navigation in sidebar."""
@@ -127,29 +178,28 @@ def show_sidebar_navigation():
     # Show authentication status
     show_auth_sidebar()
     
-    if check_authentication():
+    # Read the login state once for the rest of the sidebar
+    authenticated = check_authentication()
+    user = get_current_user()
+    
+    if authenticated:
         st.sidebar.markdown("---")
         st.sidebar.subheader("📱 Navigation")
         
-        # Navigation buttons
-        pages = {
-            "🏠 Dashboard": "Dashboard",
-            "📝 Tasks": "Tasks",
-            "🕐 Attendance": "Attendance",
-            "📊 Reports": "Reports"
-        }
-        
-        for page_label, page_key in pages.items():
-            if st.sidebar.button(page_label, use_container_width=True):
-                st.session_state.current_page = page_key
-                st.rerun()
+        # Navigation radio, bound directly to the current page
+        st.sidebar.radio(
+            "Navigation",
+            list(PAGE_LABELS),
+            format_func=PAGE_LABELS.get,
+            key="current_page",
+            label_visibility="collapsed"
+        )
         
         st.sidebar.markdown("---")
         
         # User info
-        user_name = get_current_user_name()
-        if user_name:
-            st.sidebar.success(f"👤 Hello, {user_name}!")
+        if user:
+            st.sidebar.success(f"👤 Hello, {user[1]}!")
         
         # App info
         st.sidebar.markdown("---")
@@ -177,7 +227,7 @@ def show_sidebar_navigation():
 def main():
     """Main application logic."""
     # Initialize database and session state
-    init_db()
+    initialize_database()
     initialize_session_state()
     
     # Show sidebar navigation
@@ -192,34 +242,9 @@ def main():
         st.markdown('</div>', unsafe_allow_html=True)
         
         # Show features overview
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("""
-            ### 📝 Task Management
-            - Create, edit, and organize tasks
-            - Set priorities and due dates
-            - Track progress with status updates
-            - Categorize tasks for better organization
-            """)
-        
-        with col2:
-            st.markdown("""
-            ### 📊 Analytics & Reports
-            - View productivity metrics
-            - Generate detailed reports
-            - Export data to Excel
-            - Track completion rates
-            """)
-        
-        with col3:
-            st.markdown("""
-            ### 🔐 Secure & Personal
-            - Secure user authentication
-            - Personal task management
-            - Data privacy protection
-            - Session management
-            """)
+        for column, feature_html in zip(st.columns(3), FEATURES_HTML):
+            with column:
+                st.html(feature_html)
         
         st.markdown("---")
         
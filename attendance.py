@@ -1,14 +1,24 @@
 import streamlit as st
-from datetime import datetime, date, time
+import pandas as pd
+from datetime import datetime, time
 from database import (create_attendance_entry, update_attendance_entry, 
                      delete_attendance_entry, get_attendance_data)
 from auth import get_current_user_id
 
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_attendance_data(user_id: int, start_date: str, end_date: str):
+    """Get attendance data for a date range, cached across reruns."""
+    return get_attendance_data(user_id, start_date, end_date)
+
+def to_iso_datetime(date_str: str, time_value: time) -> str:
+    """Build an ISO datetime string from an ISO date string and a time."""
+    return f"{date_str}T{time_value.isoformat(timespec='seconds')}"
+
 def add_attendance_entry():
     """Form to add new attendance entry."""
     st.subheader("➕ Add Attendance Entry")
     
-    with st.form("attendance_form"):
+    with st.form("attendance_form", clear_on_submit=True):
         col1, col2 = st.columns(2)
         
         with col1:
@@ -25,12 +35,14 @@ def add_attendance_entry():
             date_str = attendance_date.isoformat()
             
             # Convert time to datetime string
-            login_datetime = datetime.combine(attendance_date, login_time).isoformat()
-            logout_datetime = datetime.combine(attendance_date, logout_time).isoformat()
+            login_datetime = to_iso_datetime(date_str, login_time)
+            logout_datetime = to_iso_datetime(date_str, logout_time)
             
             if create_attendance_entry(user_id, date_str, login_datetime, logout_datetime):
+                cached_attendance_data.clear()
+                # The View and Edit tabs render after this one, so they pick up
+                # the new entry in this same run without another rerun
                 st.success("Attendance entry added successfully!")
-                st.rerun()
             else:
                 st.error("Failed to add attendance entry")
 
@@ -45,7 +57,7 @@ def display_attendance_entries():
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=30)
     
-    attendance_data = get_attendance_data(user_id, start_date.isoformat(), end_date.isoformat())
+    attendance_data = cached_attendance_data(user_id, start_date.isoformat(), end_date.isoformat())
     
     if not attendance_data:
         st.info("No attendance entries found. Add your first entry above!")
@@ -53,9 +65,12 @@ def display_attendance_entries():
     
     st.subheader("📋 Recent Attendance Entries")
     
-    for attendance in attendance_data:
-        date_str, login_time, logout_time = attendance
-        
+    # Parse and format all login/logout times in one pass
+    df = pd.DataFrame(attendance_data, columns=['Date', 'Login', 'Logout'])
+    for column in ('Login', 'Logout'):
+        df[column] = pd.to_datetime(df[column], format='ISO8601', errors='coerce').dt.strftime("%H:%M").fillna("")
+    
+    for date_str, login_formatted, logout_formatted in df.itertuples(index=False):
         with st.container():
             col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
             
@@ -63,26 +78,17 @@ def display_attendance_entries():
                 st.write(f"📅 **{date_str}**")
             
             with col2:
-                login_formatted = ""
-                if login_time:
-                    login_dt = datetime.fromisoformat(login_time)
-                    login_formatted = login_dt.strftime("%H:%M")
                 st.write(f"🕐 Login: {login_formatted}")
             
             with col3:
-                logout_formatted = ""
-                if logout_time:
-                    logout_dt = datetime.fromisoformat(logout_time)
-                    logout_formatted = logout_dt.strftime("%H:%M")
                 st.write(f"🕐 Logout: {logout_formatted}")
             
             with col4:
                 if st.button("🗑️", key=f"delete_{date_str}", help="Delete entry"):
-                    if delete_attendance_entry(user_id, date_str):
-                        st.success("Entry deleted!")
-                        st.rerun()
-                    else:
-                        st.error("Failed to delete entry")
+                    delete_attendance_entry(user_id, date_str)
+                    cached_attendance_data.clear()
+                    st.success("Entry deleted!")
+                    st.rerun()
             
             st.divider()
 
@@ -99,24 +105,20 @@ def edit_attendance_entry():
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=30)
     
-    attendance_data = get_attendance_data(user_id, start_date.isoformat(), end_date.isoformat())
+    attendance_data = cached_attendance_data(user_id, start_date.isoformat(), end_date.isoformat())
     
     if not attendance_data:
         st.info("No attendance entries to edit.")
         return
     
-    # Create options for selectbox
-    date_options = [attendance[0] for attendance in attendance_data]
+    # Index entries by date; the keys double as the selectbox options
+    entries_by_date = {attendance[0]: attendance for attendance in attendance_data}
     
     with st.form("edit_attendance_form"):
-        selected_date = st.selectbox("Select Date to Edit", date_options)
+        selected_date = st.selectbox("Select Date to Edit", list(entries_by_date))
         
         # Find the selected attendance entry
-        selected_entry = None
-        for attendance in attendance_data:
-            if attendance[0] == selected_date:
-                selected_entry = attendance
-                break
+        selected_entry = entries_by_date.get(selected_date)
         
         if selected_entry:
             date_str, login_time, logout_time = selected_entry
@@ -145,11 +147,11 @@ def edit_attendance_entry():
             
             if update_submit:
                 # Convert time to datetime string
-                date_obj = datetime.fromisoformat(selected_date).date()
-                new_login_datetime = datetime.combine(date_obj, new_login_time).isoformat()
-                new_logout_datetime = datetime.combine(date_obj, new_logout_time).isoformat()
+                new_login_datetime = to_iso_datetime(selected_date, new_login_time)
+                new_logout_datetime = to_iso_datetime(selected_date, new_logout_time)
                 
                 if update_attendance_entry(user_id, selected_date, new_login_datetime, new_logout_datetime):
+                    cached_attendance_data.clear()
                     st.success("Attendance entry updated successfully!")
                     st.rerun()
                 else:
@@ -163,7 +165,11 @@ def attendance_page():
         return
     
     st.title("🕐 Attendance Management")
-    
+    show_attendance_tabs()
+
+@st.fragment
+def show_attendance_tabs():
+    """Attendance tabs; interactions inside them rerun only this section."""
     # Tab layout
     tab1, tab2, tab3 = st.tabs(["Add Entry", "View Entries", "Edit Entry"])
     
@@ -1,6 +1,14 @@
 import streamlit as st
 import bcrypt
-from database import init_db, get_user_by_email, get_user_by_username, create_user
+from database import get_user_by_email, get_user_by_username, create_user
+
+# bcrypt work factor for new password hashes
+BCRYPT_ROUNDS = 10
+
+# Checked against when the username is unknown so that login takes the same time
+# whether or not the account exists. Computing it at import also warms up bcrypt
+# and the salt RNG, so the first registration or login doesn't pay for that.
+_DUMMY_HASH = bcrypt.hashpw(b"dummy-password", bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
 
 def hash_password(password: str) -> str:
     """
@@ -12,7 +20,7 @@ def hash_password(password: str) -> str:
     :type password: str
     :return: The `hash_password` function returns the hashed password as a string.
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -92,11 +100,12 @@ def login_user():
                 return False
                 
             user = get_user_by_username(username)
-            if user and verify_password(password, user[2]):  # user[2] is hashed_password
+            # Always run bcrypt, even for unknown users, to avoid a timing oracle
+            hashed = user[2] if user else _DUMMY_HASH  # user[2] is hashed_password
+            if verify_password(password, hashed) and user:
                 st.session_state.logged_in = True
-                st.session_state.user_id = user[0]
-                st.session_state.user_name = user[1]
-                st.session_state.user_email = user[3]
+                # (id, name, email) -- the password hash stays out of the session
+                st.session_state.user_record = (user[0], user[1], user[3])
                 
                 st.success(f"Welcome back, {user[1]}!")
                 st.rerun()
@@ -106,39 +115,38 @@ def login_user():
                 return False
 
 def logout_user():
-    """Handle user logout."""
-    st.session_state.logged_in = False
-    st.session_state.user_id = None
-    st.session_state.user_name = None
-    st.session_state.user_email = None
-    st.success("Logged out successfully!")
-    st.rerun()
+    """Handle user logout; used as a button callback, so no explicit rerun."""
+    for key in ('logged_in', 'user_record'):
+        st.session_state.pop(key, None)
 
 def check_authentication():
     """Check if user is authenticated."""
     return st.session_state.get('logged_in', False)
 
+def get_current_user():
+    """Get current user's (id, name, email) record, or None if logged out."""
+    return st.session_state.get('user_record', None)
+
 def get_current_user_id():
     """Get current user's ID."""
-    return st.session_state.get('user_id', None)
+    user = get_current_user()
+    return user[0] if user else None
 
 def get_current_user_name():
     """Get current user's name."""
-    return st.session_state.get('user_name', None)
+    user = get_current_user()
+    return user[1] if user else None
 
 def show_auth_sidebar():
     """Show authentication options in sidebar."""
     if check_authentication():
         st.sidebar.success(f"Logged in as: {get_current_user_name()}")
-        if st.sidebar.button("Logout"):
-            logout_user()
+        st.sidebar.button("Logout", on_click=logout_user)
     else:
         st.sidebar.info("Please login to access your tasks")
 
 def auth_page():
     """Main authentication page."""
-    init_db()
-    
     if check_authentication():
         st.success(f"Welcome, {get_current_user_name()}!")
         return True
@@ -1,7 +1,14 @@
 import sqlite3
 import os
+import atexit
+import functools
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import Iterable, List, NamedTuple, Tuple, Optional
+
+import pandas as pd
 
 DATABASE_PATH = "data/app.db"
 
@@ -9,43 +16,149 @@ def ensure_data_directory():
     """Ensure the data directory exists."""
     os.makedirs("data", exist_ok=True)
 
-def get_connection():
-    """Get database connection."""
+# Applied to every new connection. WAL lets readers run alongside a writer and,
+# with synchronous=NORMAL, commits without an fsync per transaction.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Connections are bound to a thread while it runs and returned to this idle pool
+# when the thread exits. Streamlit starts a new script thread for most reruns, so
+# the pool is what lets a connection (and its page cache) outlive a single rerun.
+_idle_connections = queue.SimpleQueue()
+_local = threading.local()
+
+class _PooledConnection:
+    """Holds a thread's connection and hands it back to the pool on thread exit."""
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+    
+    def __del__(self):
+        _idle_connections.put(self.conn)
+
+def open_connection() -> sqlite3.Connection:
+    """Open a new database connection with the standard pragmas applied."""
     ensure_data_directory()
-    return sqlite3.connect(DATABASE_PATH)
+    # Only ever used by one thread at a time, but may move between threads
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False, cached_statements=256)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def get_connection():
+    """Get this thread's database connection, reusing an idle one if possible."""
+    pooled = getattr(_local, "pooled", None)
+    if pooled is None:
+        try:
+            conn = _idle_connections.get_nowait()
+        except queue.Empty:
+            conn = open_connection()
+        pooled = _local.pooled = _PooledConnection(conn)
+    return pooled.conn
+
+def close_idle_connections():
+    """Close all pooled connections that no thread is using."""
+    while True:
+        try:
+            _idle_connections.get_nowait().close()
+        except queue.Empty:
+            break
+
+atexit.register(close_idle_connections)
+
+# Stored in PRAGMA user_version once init_db has brought the schema up to date.
+# Bump it whenever init_db gains a table, column or index.
+SCHEMA_VERSION = 2
 
 def init_db():
     """Initialize the database with required tables."""
     conn = get_connection()
     cursor = conn.cursor()
     
-    # Create users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            hashed_password TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Check if tasks table exists and migrate if needed
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='tasks'")
-    table_exists = cursor.fetchone()
+    cursor.execute("PRAGMA user_version")
+    if cursor.fetchone()[0] >= SCHEMA_VERSION:
+        return
     
-    if table_exists:
-        # Check if the table has the old schema
-        cursor.execute("PRAGMA table_info(tasks)")
-        columns = [column[1] for column in cursor.fetchall()]
+    with conn:
+        # Hold the write lock so concurrent first starts migrate only once
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            return
         
-        if 'due_date' in columns and 'task_date' not in columns:
-            # Migrate the table
-            print("Migrating tasks table...")
+        # Create users table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                hashed_password TEXT NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Check if tasks table exists and migrate if needed
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='tasks'")
+        table_exists = cursor.fetchone()
+        
+        if table_exists:
+            # Check if the table has the old schema
+            cursor.execute("PRAGMA table_info(tasks)")
+            columns = [column[1] for column in cursor.fetchall()]
             
-            # Create new table with correct schema
+            if 'due_date' in columns and 'task_date' not in columns:
+                # Migrate the table
+                print("Migrating tasks table...")
+                
+                # A copy left by a migration that ran before it was transactional
+                cursor.execute('DROP TABLE IF EXISTS tasks_new')
+                
+                # Create new table with correct schema
+                cursor.execute('''
+                    CREATE TABLE tasks_new (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user_id INTEGER NOT NULL,
+                        title TEXT NOT NULL,
+                        description TEXT,
+                        status TEXT DEFAULT 'Pending',
+                        priority TEXT DEFAULT 'Medium',
+                        category TEXT DEFAULT 'General',
+                        task_date DATE NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        completed_at TIMESTAMP,
+                        FOREIGN KEY (user_id) REFERENCES users (id)
+                    )
+                ''')
+                
+                # Copy data from old table, renaming due_date to task_date and updating status
+                cursor.execute('''
+                    INSERT INTO tasks_new (id, user_id, title, description, status, priority, category, task_date, created_at, completed_at)
+                    SELECT id, user_id, title, description, 
+                           CASE 
+                               WHEN status = 'To Do' THEN 'Pending'
+                               WHEN status = 'In Progress' THEN 'Pending' 
+                               WHEN status = 'Done' THEN 'Completed'
+                               ELSE status
+                           END as status,
+                           priority, category, 
+                           COALESCE(due_date, date('now')) as task_date, 
+                           created_at, completed_at
+                    FROM tasks
+                ''')
+                
+                # Drop old table and rename new one
+                cursor.execute('DROP TABLE tasks')
+                cursor.execute('ALTER TABLE tasks_new RENAME TO tasks')
+                print("Migration completed!")
+        else:
+            # Create new tasks table
             cursor.execute('''
-                CREATE TABLE tasks_new (
+                CREATE TABLE tasks (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER NOT NULL,
                     title TEXT NOT NULL,
@@ -59,267 +172,370 @@ def init_db():
                     FOREIGN KEY (user_id) REFERENCES users (id)
                 )
             ''')
-            
-            # Copy data from old table, renaming due_date to task_date and updating status
-            cursor.execute('''
-                INSERT INTO tasks_new (id, user_id, title, description, status, priority, category, task_date, created_at, completed_at)
-                SELECT id, user_id, title, description, 
-                       CASE 
-                           WHEN status = 'To Do' THEN 'Pending'
-                           WHEN status = 'In Progress' THEN 'Pending' 
-                           WHEN status = 'Done' THEN 'Completed'
-                           ELSE status
-                       END as status,
-                       priority, category, 
-                       COALESCE(due_date, date('now')) as task_date, 
-                       created_at, completed_at
-                FROM tasks
-            ''')
-            
-            # Drop old table and rename new one
-            cursor.execute('DROP TABLE tasks')
-            cursor.execute('ALTER TABLE tasks_new RENAME TO tasks')
-            print("Migration completed!")
-    else:
-        # Create new tasks table
+        
+        # Create attendance table
         cursor.execute('''
-            CREATE TABLE tasks (
+            CREATE TABLE IF NOT EXISTS attendance (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                status TEXT DEFAULT 'Pending',
-                priority TEXT DEFAULT 'Medium',
-                category TEXT DEFAULT 'General',
-                task_date DATE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                completed_at TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
+                date DATE NOT NULL,
+                login_time TIMESTAMP,
+                logout_time TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id),
+                UNIQUE(user_id, date)
             )
         ''')
-    
-    # Create attendance table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS attendance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            date DATE NOT NULL,
-            login_time TIMESTAMP,
-            logout_time TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            UNIQUE(user_id, date)
+        
+        # Indexes for the per-user task queries. Attendance lookups by (user_id, date)
+        # are already served by the index behind its UNIQUE constraint.
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_created ON tasks (user_id, created_at)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_status ON tasks (user_id, status, created_at)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_date ON tasks (user_id, task_date)"
         )
-    ''')
+        
+        # Gather planner statistics the first time the indexes exist
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'")
+        if not cursor.fetchone():
+            cursor.execute("ANALYZE")
+        
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+def ttl_cache(ttl: float, maxsize: int = 1024):
+    """Cache a single-argument lookup in memory for `ttl` seconds.
     
-    conn.commit()
-    conn.close()
+    The wrapped function gains an `invalidate(key)` method to drop one entry.
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(key):
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            
+            value = func(key)
+            with lock:
+                if key not in cache and len(cache) >= maxsize:
+                    # Evict the oldest entry
+                    cache.pop(next(iter(cache)))
+                cache[key] = (now + ttl, value)
+            return value
+        
+        def invalidate(key):
+            with lock:
+                cache.pop(key, None)
+        
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
 
 # User operations
 def create_user(name: str, email: str, hashed_password: str) -> bool:
     """Create a new user."""
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO users (name, email, hashed_password) VALUES (?, ?, ?)",
-            (name, email, hashed_password)
-        )
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO users (name, email, hashed_password) VALUES (?, ?, ?)",
+                (name, email, hashed_password)
+            )
+        # Either lookup may have cached "not found" for the new account
+        get_user_by_username.invalidate(name)
+        get_user_by_email.invalidate(email)
         return True
     except sqlite3.IntegrityError:
         return False
 
+@ttl_cache(ttl=60)
 def get_user_by_email(email: str) -> Optional[Tuple]:
     """Get user by email."""
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, name, hashed_password, email FROM users WHERE email = ?", (email,))
     user = cursor.fetchone()
-    conn.close()
     return user
 
+@ttl_cache(ttl=60)
 def get_user_by_username(username: str) -> Optional[Tuple]:
     """Get user by username."""
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, name, hashed_password, email FROM users WHERE name = ?", (username,))
     user = cursor.fetchone()
-    conn.close()
     return user
 
 # Task operations
+class TaskListItem(NamedTuple):
+    """A task row as the task page lists it, with fields in TASK_LIST_COLUMNS order."""
+    id: int
+    user_id: int
+    title: str
+    description: Optional[str]
+    status: str
+    priority: str
+    category: str
+    task_date: str
+
+def task_list_row_factory(cursor: sqlite3.Cursor, row: tuple) -> TaskListItem:
+    """Row factory building TaskListItem tuples from SELECT {TASK_LIST_COLUMNS} queries."""
+    return TaskListItem._make(row)
+
+# Queries are kept as constants so every call reuses the same SQL text,
+# which the connection's prepared-statement cache is keyed on
+# The task page's columns; it never shows the timestamps, so they are left out
+TASK_LIST_COLUMNS = (
+    "id, user_id, title, description, status, priority, category, task_date"
+)
+SQL_TASK_DIGEST_BY_USER_RANGE = (
+    "SELECT task_date, title, status, priority, category FROM tasks "
+    "WHERE user_id = ? AND task_date BETWEEN ? AND ? ORDER BY task_date, created_at"
+)
+SQL_TASK_STATUS_COUNTS = """
+    SELECT COALESCE(SUM(status = 'Pending'), 0),
+           COALESCE(SUM(status = 'In Progress'), 0),
+           COALESCE(SUM(status = 'Completed'), 0),
+           COUNT(*)
+    FROM tasks WHERE user_id = ?
+"""
+SQL_REPORT_SUMMARY = """
+    SELECT COUNT(DISTINCT task_date),
+           COUNT(*),
+           COALESCE(SUM(status = 'Pending'), 0),
+           COALESCE(SUM(status = 'In Progress'), 0),
+           COALESCE(SUM(status = 'Completed'), 0)
+    FROM tasks
+    WHERE user_id = ? AND task_date BETWEEN ? AND ?
+"""
+SQL_INSERT_TASK = """
+    INSERT INTO tasks (user_id, title, description, task_date, priority, category)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# Parameters are (status, now, task_id, user_id). completed_at is stamped when a
+# task becomes Completed, cleared when it stops being Completed and otherwise kept;
+# the CASE sees the row's status from before the update.
+SQL_UPDATE_USER_TASK_STATUS = """
+    UPDATE tasks SET
+        completed_at = CASE
+            WHEN ?1 = 'Completed' AND status IS NOT 'Completed' THEN ?2
+            WHEN ?1 IS NOT 'Completed' AND status = 'Completed' THEN NULL
+            ELSE completed_at
+        END,
+        status = ?1
+    WHERE id = ?3 AND user_id = ?4
+"""
+SQL_UPDATE_TASK = """
+    UPDATE tasks SET title = ?, description = ?, task_date = ?, priority = ?, category = ?
+    WHERE id = ?
+"""
+SQL_DELETE_USER_TASK = "DELETE FROM tasks WHERE id = ? AND user_id = ?"
+
 def create_task(user_id: int, title: str, description: str = "", task_date: str = None, 
                 priority: str = "Medium", category: str = "General") -> bool:
     """Create a new task."""
+    return create_tasks_bulk([(user_id, title, description, task_date, priority, category)])
+
+def create_tasks_bulk(rows: Iterable[Tuple]) -> bool:
+    """Create many tasks in a single transaction.
+    
+    Each row is (user_id, title, description, task_date, priority, category).
+    """
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO tasks (user_id, title, description, task_date, priority, category)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (user_id, title, description, task_date, priority, category))
-        conn.commit()
-        conn.close()
+        with conn:
+            # Take the write lock up front rather than on the first insert
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.cursor()
+            cursor.executemany(SQL_INSERT_TASK, rows)
         return True
-    except Exception:
+    except sqlite3.IntegrityError:
         return False
 
-def get_user_tasks(user_id: int, status_filter: str = None) -> List[Tuple]:
-    """Get all tasks for a user, optionally filtered by status."""
+def escape_like(text: str) -> str:
+    """Escape LIKE wildcards so text matches literally (with ESCAPE '\\')."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def get_user_tasks_filtered(user_id: int, status: str = None, task_date: str = None,
+                            search: str = None, limit: int = None,
+                            offset: int = 0) -> List[TaskListItem]:
+    """Get a user's tasks matching the task page filters, newest first.
+    
+    search matches title or description case-insensitively (ASCII, as LIKE does).
+    limit and offset select one page of the results.
+    """
     conn = get_connection()
     cursor = conn.cursor()
+    cursor.row_factory = task_list_row_factory
     
-    if status_filter:
-        cursor.execute(
-            "SELECT * FROM tasks WHERE user_id = ? AND status = ? ORDER BY created_at DESC",
-            (user_id, status_filter)
-        )
-    else:
-        cursor.execute(
-            "SELECT * FROM tasks WHERE user_id = ? ORDER BY created_at DESC",
-            (user_id,)
-        )
+    # Only a handful of combinations exist, so the statement cache covers them all
+    conditions = ["user_id = ?"]
+    params = [user_id]
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if task_date:
+        conditions.append("task_date = ?")
+        params.append(task_date)
+    if search:
+        conditions.append("(title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')")
+        pattern = f"%{escape_like(search)}%"
+        params.extend((pattern, pattern))
+    
+    sql = (f"SELECT {TASK_LIST_COLUMNS} FROM tasks WHERE {' AND '.join(conditions)} "
+           "ORDER BY created_at DESC, id DESC")
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params.extend((limit, offset))
     
-    tasks = cursor.fetchall()
-    conn.close()
-    return tasks
+    cursor.execute(sql, params)
+    return cursor.fetchall()
 
-def update_task_status(task_id: int, status: str) -> bool:
-    """Update task status."""
-    try:
-        conn = get_connection()
+def get_user_task_digest(user_id: int, start_date: str, end_date: str) -> pd.DataFrame:
+    """Get the report columns of a user's tasks in a task date range as a DataFrame.
+    
+    Leaves out ids, descriptions and timestamps, which the reports never show.
+    """
+    conn = get_connection()
+    return pd.read_sql_query(
+        SQL_TASK_DIGEST_BY_USER_RANGE, conn, params=(user_id, start_date, end_date)
+    )
+
+def update_task_statuses_bulk(user_id: int, updates: Iterable[Tuple[int, str]]) -> None:
+    """Update the status of many of a user's tasks in a single transaction.
+    
+    Each update is (task_id, status); tasks of other users are left alone.
+    """
+    now = datetime.now().isoformat()
+    rows = [(status, now, task_id, user_id) for task_id, status in updates]
+    conn = get_connection()
+    with conn:
+        # Take the write lock up front rather than on the first update
+        conn.execute("BEGIN IMMEDIATE")
         cursor = conn.cursor()
-        
-        completed_at = datetime.now().isoformat() if status == "Done" else None
-        
-        cursor.execute(
-            "UPDATE tasks SET status = ?, completed_at = ? WHERE id = ?",
-            (status, completed_at, task_id)
-        )
-        conn.commit()
-        conn.close()
-        return True
-    except Exception:
-        return False
+        cursor.executemany(SQL_UPDATE_USER_TASK_STATUS, rows)
 
 def update_task(task_id: int, title: str, description: str, task_date: str = None,
                 priority: str = "Medium", category: str = "General") -> bool:
     """Update task details."""
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE tasks SET title = ?, description = ?, task_date = ?, priority = ?, category = ?
-            WHERE id = ?
-        ''', (title, description, task_date, priority, category, task_id))
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_UPDATE_TASK,
+                           (title, description, task_date, priority, category, task_id))
         return True
-    except Exception:
+    except sqlite3.IntegrityError:
         return False
 
-def delete_task(task_id: int) -> bool:
-    """Delete a task."""
-    try:
-        conn = get_connection()
+def delete_tasks_bulk(user_id: int, task_ids: Iterable[int]) -> None:
+    """Delete many of a user's tasks in a single transaction; other users' tasks are left alone."""
+    conn = get_connection()
+    with conn:
+        # Take the write lock up front rather than on the first delete
+        conn.execute("BEGIN IMMEDIATE")
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        conn.commit()
-        conn.close()
-        return True
-    except Exception:
-        return False
+        cursor.executemany(SQL_DELETE_USER_TASK, [(task_id, user_id) for task_id in task_ids])
 
 def get_task_statistics(user_id: int) -> dict:
     """Get task statistics for a user."""
     conn = get_connection()
     cursor = conn.cursor()
     
-    # Count tasks by status
-    cursor.execute('''
-        SELECT status, COUNT(*) FROM tasks WHERE user_id = ? GROUP BY status
-    ''', (user_id,))
-    status_counts = dict(cursor.fetchall())
+    # Count tasks by status in one pass over the (user_id, status) index
+    cursor.execute(SQL_TASK_STATUS_COUNTS, (user_id,))
+    pending, in_progress, completed, total = cursor.fetchone()
     
-    conn.close()
+    return {
+        'pending': pending,
+        'in_progress': in_progress,
+        'completed': completed,
+        'total': total
+    }
+
+def get_report_summary(user_id: int, start_date: str, end_date: str) -> dict:
+    """Get day and status counts for tasks dated between two ISO dates (inclusive)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(SQL_REPORT_SUMMARY, (user_id, start_date, end_date))
+    days_tracked, total, pending, in_progress, completed = cursor.fetchone()
     
     return {
-        'pending': status_counts.get('Pending', 0),
-        'in_progress': status_counts.get('In Progress', 0),
-        'completed': status_counts.get('Completed', 0),
-        'total': sum(status_counts.values())
+        'days_tracked': days_tracked,
+        'total': total,
+        'pending': pending,
+        'in_progress': in_progress,
+        'completed': completed
     }
 
 # Attendance operations
+SQL_ATTENDANCE_BY_USER = (
+    "SELECT date, login_time, logout_time FROM attendance WHERE user_id = ? ORDER BY date DESC"
+)
+SQL_ATTENDANCE_BY_USER_RANGE = '''
+    SELECT date, login_time, logout_time FROM attendance 
+    WHERE user_id = ? AND date BETWEEN ? AND ?
+    ORDER BY date DESC
+'''
+SQL_REPLACE_ATTENDANCE = '''
+    INSERT OR REPLACE INTO attendance (user_id, date, login_time, logout_time)
+    VALUES (?, ?, ?, ?)
+'''
+# Insert, or fill in only the times that were given on the existing row
+SQL_UPSERT_ATTENDANCE = '''
+    INSERT INTO attendance (user_id, date, login_time, logout_time)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (user_id, date) DO UPDATE SET
+        login_time = COALESCE(excluded.login_time, attendance.login_time),
+        logout_time = COALESCE(excluded.logout_time, attendance.logout_time)
+'''
+SQL_DELETE_ATTENDANCE = "DELETE FROM attendance WHERE user_id = ? AND date = ?"
+
 def create_attendance_entry(user_id: int, date: str, login_time: str = None, logout_time: str = None) -> bool:
     """Create or update attendance entry manually."""
+    return create_attendance_bulk([(user_id, date, login_time, logout_time)])
+
+def create_attendance_bulk(rows: Iterable[Tuple]) -> bool:
+    """Create or replace many attendance entries in a single transaction.
+    
+    Each row is (user_id, date, login_time, logout_time).
+    """
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO attendance (user_id, date, login_time, logout_time)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, date, login_time, logout_time))
-        
-        conn.commit()
-        conn.close()
+        with conn:
+            # Take the write lock up front rather than on the first insert
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.cursor()
+            cursor.executemany(SQL_REPLACE_ATTENDANCE, rows)
         return True
-    except Exception:
+    except sqlite3.IntegrityError:
         return False
 
 def update_attendance_entry(user_id: int, date: str, login_time: str = None, logout_time: str = None) -> bool:
     """Update existing attendance entry."""
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Check if entry exists
-        cursor.execute('SELECT * FROM attendance WHERE user_id = ? AND date = ?', (user_id, date))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing entry
-            if login_time is not None and logout_time is not None:
-                cursor.execute('''
-                    UPDATE attendance SET login_time = ?, logout_time = ? 
-                    WHERE user_id = ? AND date = ?
-                ''', (login_time, logout_time, user_id, date))
-            elif login_time is not None:
-                cursor.execute('''
-                    UPDATE attendance SET login_time = ? 
-                    WHERE user_id = ? AND date = ?
-                ''', (login_time, user_id, date))
-            elif logout_time is not None:
-                cursor.execute('''
-                    UPDATE attendance SET logout_time = ? 
-                    WHERE user_id = ? AND date = ?
-                ''', (logout_time, user_id, date))
-        else:
-            # Create new entry
-            cursor.execute('''
-                INSERT INTO attendance (user_id, date, login_time, logout_time)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, date, login_time, logout_time))
-        
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_UPSERT_ATTENDANCE, (user_id, date, login_time, logout_time))
         return True
-    except Exception:
+    except sqlite3.IntegrityError:
         return False
 
-def delete_attendance_entry(user_id: int, date: str) -> bool:
+def delete_attendance_entry(user_id: int, date: str) -> None:
     """Delete attendance entry."""
-    try:
-        conn = get_connection()
+    conn = get_connection()
+    with conn:
         cursor = conn.cursor()
-        cursor.execute('DELETE FROM attendance WHERE user_id = ? AND date = ?', (user_id, date))
-        conn.commit()
-        conn.close()
-        return True
-    except Exception:
-        return False
+        cursor.execute(SQL_DELETE_ATTENDANCE, (user_id, date))
 
 def get_attendance_data(user_id: int, start_date: str = None, end_date: str = None) -> List[Tuple]:
     """Get attendance data for a user."""
@@ -327,19 +543,11 @@ def get_attendance_data(user_id: int, start_date: str = None, end_date: str = No
     cursor = conn.cursor()
     
     if start_date and end_date:
-        cursor.execute('''
-            SELECT date, login_time, logout_time FROM attendance 
-            WHERE user_id = ? AND date BETWEEN ? AND ?
-            ORDER BY date DESC
-        ''', (user_id, start_date, end_date))
+        cursor.execute(SQL_ATTENDANCE_BY_USER_RANGE, (user_id, start_date, end_date))
     else:
-        cursor.execute('''
-            SELECT date, login_time, logout_time FROM attendance 
-            WHERE user_id = ? ORDER BY date DESC
-        ''', (user_id,))
+        cursor.execute(SQL_ATTENDANCE_BY_USER, (user_id,))
     
     attendance = cursor.fetchall()
-    conn.close()
     return attendance
 
 def get_user_attendance(user_id: int, start_date, end_date) -> List[Tuple]:
@@ -1,317 +1,145 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from database import get_user_tasks, get_task_statistics, get_attendance_data
+from database import get_user_task_digest, get_report_summary
 from auth import get_current_user_id, get_current_user_name
+from attendance import cached_attendance_data
 import io
+import xlsxwriter
 
-def create_tasks_dataframe(tasks):
-    """Convert tasks to pandas DataFrame."""
-    if not tasks:
-        return pd.DataFrame()
-    
-    df = pd.DataFrame(tasks, columns=[
-        'ID', 'User_ID', 'Title', 'Description', 'Status', 
-        'Priority', 'Category', 'Due_Date', 'Created_At', 'Completed_At'
-    ])
-    
-    # Convert date columns
-    df['Created_At'] = pd.to_datetime(df['Created_At'])
-    df['Due_Date'] = pd.to_datetime(df['Due_Date'], errors='coerce')
-    df['Completed_At'] = pd.to_datetime(df['Completed_At'], errors='coerce')
-    
-    return df
+PRIORITY_ICONS = {"Low": "🟢", "Medium": "🟡", "High": "🔴"}
+STATUS_ICONS = {"Pending": "⏳", "In Progress": "🔄", "Completed": "✅"}
 
-def generate_task_summary_chart(stats):
-    """Generate task summary chart."""
-    status_data = {
-        'Status': ['To Do', 'In Progress', 'Done', 'Overdue'],
-        'Count': [stats['to_do'], stats['in_progress'], stats['done'], stats['overdue']]
-    }
-    
-    df = pd.DataFrame(status_data)
-    return df
+EXCEL_OPTIONS = {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd hh:mm:ss'}
 
-def generate_productivity_metrics(tasks_df):
-    """Calculate productivity metrics."""
-    if tasks_df.empty:
-        return {}
-    
-    total_tasks = len(tasks_df)
-    completed_tasks = len(tasks_df[tasks_df['Status'] == 'Done'])
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    
-    # Calculate average completion time for completed tasks
-    completed_df = tasks_df[tasks_df['Status'] == 'Done'].copy()
-    if not completed_df.empty and completed_df['Completed_At'].notna().any():
-        completed_df['completion_time'] = (
-            completed_df['Completed_At'] - completed_df['Created_At']
-        ).dt.days
-        avg_completion_time = completed_df['completion_time'].mean()
-    else:
-        avg_completion_time = 0
-    
-    return {
-        'total_tasks': total_tasks,
-        'completed_tasks': completed_tasks,
-        'completion_rate': completion_rate,
-        'avg_completion_time': avg_completion_time
-    }
+def write_sheet(workbook, sheet_name: str, df):
+    """Write a DataFrame to a new worksheet row by row, header first."""
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, list(df.columns))
+    
+    # Plain Python values with missing ones as blanks
+    rows = df.astype(object).where(df.notna(), None)
+    for row_index, row in enumerate(rows.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_index, 0, row)
 
-def export_to_excel(tasks_df, stats, metrics):
-    """Export data to Excel format."""
-    output = io.BytesIO()
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # Tasks sheet
-        if not tasks_df.empty:
-            export_df = tasks_df.copy()
-            export_df = export_df.drop(['ID', 'User_ID'], axis=1)
-            export_df.to_excel(writer, sheet_name='Tasks', index=False)
-        
-        # Summary sheet
-        summary_data = {
-            'Metric': ['Total Tasks', 'To Do', 'In Progress', 'Done', 'Overdue', 
-                      'Completion Rate (%)', 'Avg Completion Time (days)'],
-            'Value': [stats['total'], stats['to_do'], stats['in_progress'], 
-                     stats['done'], stats['overdue'], round(metrics.get('completion_rate', 0), 2),
-                     round(metrics.get('avg_completion_time', 0), 2)]
-        }
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-        
-        # Weekly breakdown
-        if not tasks_df.empty:
-            weekly_data = create_weekly_breakdown(tasks_df)
-            weekly_data.to_excel(writer, sheet_name='Weekly_Breakdown', index=False)
-    
-    output.seek(0)
-    return output
-
-def create_weekly_breakdown(tasks_df):
-    """Create weekly task breakdown."""
-    if tasks_df.empty:
-        return pd.DataFrame()
-    
-    # Group by week
-    tasks_df['Week'] = tasks_df['Created_At'].dt.to_period('W')
-    weekly_stats = tasks_df.groupby(['Week', 'Status']).size().reset_index(name='Count')
-    weekly_pivot = weekly_stats.pivot(index='Week', columns='Status', values='Count').fillna(0)
-    
-    return weekly_pivot.reset_index()
+NO_TASKS_REPORT = pd.DataFrame([{
+    'Date': 'No data',
+    'Task': 'No tasks found',
+    'Status': '-',
+    'Priority': '-',
+    'Category': '-'
+}])
 
-def show_date_range_selector():
-    """Show date range selector for filtering reports."""
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        start_date = st.date_input(
-            "Start Date",
-            value=datetime.now().date() - timedelta(days=30)
-        )
-    
-    with col2:
-        end_date = st.date_input(
-            "End Date",
-            value=datetime.now().date()
-        )
-    
-    return start_date, end_date
-
-def filter_tasks_by_date(tasks_df, start_date, end_date):
-    """Filter tasks by date range."""
-    if tasks_df.empty:
-        return tasks_df
-    
-    mask = (
-        (tasks_df['Created_At'].dt.date >= start_date) & 
-        (tasks_df['Created_At'].dt.date <= end_date)
-    )
-    return tasks_df[mask]
-
-def create_attendance_report_data(user_id: int, start_date: str, end_date: str):
-    """Create attendance report data combining attendance and tasks."""
-    # Get attendance data
-    attendance_data = get_attendance_data(user_id, start_date, end_date)
-    
-    # Get tasks data for the date range
-    tasks_data = get_user_tasks(user_id)
-    
-    # Create a dictionary to group tasks by date
-    tasks_by_date = {}
-    for task in tasks_data:
-        task_id, user_id_task, title, description, status, priority, category, task_date, created_at, completed_at = task
-        if task_date:  # Simplified date filtering
-            if task_date not in tasks_by_date:
-                tasks_by_date[task_date] = []
-            tasks_by_date[task_date].append({
-                'title': title,
-                'status': status,
-                'priority': priority,
-                'category': category
-            })
-    
-    # Combine attendance and tasks data
-    report_data = []
-    
-    # Add all tasks to report data
-    for task_date, daily_tasks in tasks_by_date.items():
-        # Add tasks for this date
-        for task in daily_tasks:
-            report_data.append({
-                'Date': task_date,
-                'Task': task['title'],
-                'Status': task['status'],
-                'Priority': task['priority'],
-                'Category': task['category']
-            })
+def create_attendance_report_data(user_id: int, start_date: str, end_date: str) -> pd.DataFrame:
+    """Create attendance report data, one row per task."""
+    # Get tasks for the date range straight into columns
+    tasks_df = get_user_task_digest(user_id, start_date, end_date)
+    
+    # One report row per task, in task date order
+    report_data = tasks_df.rename(columns={
+        'task_date': 'Date',
+        'title': 'Task',
+        'status': 'Status',
+        'priority': 'Priority',
+        'category': 'Category'
+    })[['Date', 'Task', 'Status', 'Priority', 'Category']]
     
     # If no tasks found, add a simple message
-    if not report_data:
-        report_data.append({
-            'Date': 'No data',
-            'Task': 'No tasks found',
-            'Status': '-',
-            'Priority': '-',
-            'Category': '-'
-        })
+    if report_data.empty:
+        return NO_TASKS_REPORT
     
     return report_data
 
-def export_attendance_excel(task_data, attendance_data, user_name: str):
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_report_data(user_id: int, start_date: str, end_date: str) -> pd.DataFrame:
+    """Get report data for a user and date range, cached across reruns."""
+    return create_attendance_report_data(user_id, start_date, end_date)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_report_summary(user_id: int, start_date: str, end_date: str) -> dict:
+    """Get report metric counts for a user and date range, cached across reruns."""
+    return get_report_summary(user_id, start_date, end_date)
+
+def export_attendance_excel(tasks_df, attendance_data, user_name: str):
     """Export attendance and task report to Excel format."""
     output = io.BytesIO()
     
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+    with xlsxwriter.Workbook(output, EXCEL_OPTIONS) as workbook:
         # Tasks sheet
-        if task_data:
-            tasks_df = pd.DataFrame(task_data)
-            tasks_df.to_excel(writer, sheet_name='Tasks', index=False)
+        if not tasks_df.empty:
+            write_sheet(workbook, 'Tasks', tasks_df)
         
         # Attendance sheet
-        if attendance_data:
-            # Format attendance data for Excel
-            attendance_excel_data = []
-            for attendance in attendance_data:
-                date, login_time, logout_time = attendance
-                
-                # Format times
-                login_formatted = "Not recorded"
-                logout_formatted = "Not recorded"
-                
-                if login_time and login_time.strip():
-                    try:
-                        login_dt = datetime.fromisoformat(login_time)
-                        login_formatted = login_dt.strftime("%H:%M:%S")
-                    except:
-                        login_formatted = login_time  # Use as-is if parsing fails
-                
-                if logout_time and logout_time.strip():
-                    try:
-                        logout_dt = datetime.fromisoformat(logout_time)
-                        logout_formatted = logout_dt.strftime("%H:%M:%S")
-                    except:
-                        logout_formatted = logout_time  # Use as-is if parsing fails
-                
-                attendance_excel_data.append({
-                    'Date': date,
-                    'Login Time': login_formatted,
-                    'Logout Time': logout_formatted
-                })
-            
-            attendance_df = pd.DataFrame(attendance_excel_data)
-            attendance_df.to_excel(writer, sheet_name='Attendance', index=False)
-        else:
-            # Create empty attendance sheet with headers
-            empty_attendance = pd.DataFrame(columns=['Date', 'Login Time', 'Logout Time'])
-            empty_attendance.to_excel(writer, sheet_name='Attendance', index=False)
+        attendance_df = pd.DataFrame(attendance_data, columns=['Date', 'Login Time', 'Logout Time'], dtype=object)
+        for column in ['Login Time', 'Logout Time']:
+            raw = attendance_df[column]
+            # Show times as HH:MM:SS, keeping unparseable values as-is
+            formatted = pd.to_datetime(raw, format='ISO8601', errors='coerce').dt.strftime("%H:%M:%S")
+            not_recorded = raw.fillna('').str.strip().eq('')
+            attendance_df[column] = formatted.fillna(raw).mask(not_recorded, "Not recorded")
+        write_sheet(workbook, 'Attendance', attendance_df)
         
         # Summary sheet
-        if task_data:
-            tasks_df = pd.DataFrame(task_data)
-            summary_data = []
-            
-            # Get unique dates
-            unique_dates = tasks_df['Date'].unique()
-            
-            for date in unique_dates:
-                date_data = tasks_df[tasks_df['Date'] == date]
-                
-                # Count tasks
-                tasks_count = len(date_data[date_data['Task'] != 'No tasks found'])
-                completed_tasks = len(date_data[date_data['Status'] == 'Completed'])
-                in_progress_tasks = len(date_data[date_data['Status'] == 'In Progress'])
-                pending_tasks = len(date_data[date_data['Status'] == 'Pending'])
-                
-                summary_data.append({
-                    'Date': date,
-                    'Total Tasks': tasks_count,
-                    'Pending Tasks': pending_tasks,
-                    'In Progress Tasks': in_progress_tasks,
-                    'Completed Tasks': completed_tasks,
-                    'Completion Rate': f"{(completed_tasks/tasks_count*100):.1f}%" if tasks_count > 0 else "0%"
-                })
+        if not tasks_df.empty:
+            # Count tasks and statuses per date in one grouping pass
+            real_tasks = tasks_df['Task'].ne('No tasks found')
+            total_tasks = real_tasks.groupby(tasks_df['Date'], sort=False).sum()
+            status_counts = (
+                tasks_df.groupby('Date', sort=False)['Status'].value_counts()
+                .unstack(fill_value=0)
+                .reindex(index=total_tasks.index, columns=['Pending', 'In Progress', 'Completed'], fill_value=0)
+            )
+            completion_rate = (status_counts['Completed'] / total_tasks * 100).map('{:.1f}%'.format)
             
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
+            summary_df = pd.DataFrame({
+                'Date': total_tasks.index,
+                'Total Tasks': total_tasks.values,
+                'Pending Tasks': status_counts['Pending'].values,
+                'In Progress Tasks': status_counts['In Progress'].values,
+                'Completed Tasks': status_counts['Completed'].values,
+                'Completion Rate': completion_rate.where(total_tasks > 0, "0%").values
+            })
+            write_sheet(workbook, 'Summary', summary_df)
     
     output.seek(0)
     return output
 
-def show_attendance_metrics(report_data):
+def show_attendance_metrics(summary):
     """Display attendance and task metrics."""
-    if not report_data:
-        return
-        
-    df = pd.DataFrame(report_data)
-    
-    # Calculate metrics
-    total_days = len(df['Date'].unique())
-    total_tasks = len(df[df['Task'] != 'No tasks found'])
-    pending_tasks = len(df[df['Status'] == 'Pending'])
-    in_progress_tasks = len(df[df['Status'] == 'In Progress'])
-    completed_tasks = len(df[df['Status'] == 'Completed'])
+    total_tasks = summary['total']
+    completed_tasks = summary['completed']
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        st.metric("Days Tracked", total_days)
+        st.metric("Days Tracked", summary['days_tracked'])
     with col2:
         st.metric("Total Tasks", total_tasks)
     with col3:
-        st.metric("⏳ Pending", pending_tasks)
+        st.metric("⏳ Pending", summary['pending'])
     with col4:
-        st.metric("🔄 In Progress", in_progress_tasks)
+        st.metric("🔄 In Progress", summary['in_progress'])
     with col5:
         completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
         st.metric("✅ Completed", f"{completed_tasks} ({completion_rate:.1f}%)")
 
 def show_daily_breakdown(report_data):
     """Show daily attendance and task breakdown."""
-    if not report_data:
+    if report_data.empty:
         return
     
-    df = pd.DataFrame(report_data)
-    
     # Group by date
-    for date in df['Date'].unique():
+    for date, date_data in report_data.groupby('Date', sort=False):
         with st.expander(f"📅 {date}", expanded=False):
-            date_data = df[df['Date'] == date]
-            
             # Show tasks
-            tasks = date_data[date_data['Task'] != 'No tasks found']
+            tasks = date_data[date_data['Task'].ne('No tasks found')]
             if not tasks.empty:
                 st.write("**Tasks:**")
-                for _, task in tasks.iterrows():
-                    if task['Status'] == 'Completed':
-                        status_icon = "✅"
-                    elif task['Status'] == 'In Progress':
-                        status_icon = "🔄"
-                    else:
-                        status_icon = "⏳"
-                    
-                    priority_icon = {"Low": "🟢", "Medium": "🟡", "High": "🔴"}.get(task['Priority'], "⚪")
-                    st.write(f"{status_icon} {priority_icon} **{task['Task']}** ({task['Category']})")
+                task_rows = tasks[['Task', 'Category', 'Priority', 'Status']].itertuples(index=False, name=None)
+                for title, category, priority, status in task_rows:
+                    status_icon = STATUS_ICONS.get(status, "⏳")
+                    priority_icon = PRIORITY_ICONS.get(priority, "⚪")
+                    st.write(f"{status_icon} {priority_icon} **{title}** ({category})")
             else:
                 st.write("No tasks recorded for this day")
 
@@ -344,16 +172,18 @@ def reports_page():
         st.error("Start date cannot be after end date")
         return
     
-    # Generate report data
+    # Generate report data, skipping the per-task rows when the range has none
     start_date_str = start_date.isoformat()
     end_date_str = end_date.isoformat()
-    report_data = create_attendance_report_data(user_id, start_date_str, end_date_str)
+    summary = cached_report_summary(user_id, start_date_str, end_date_str)
+    has_tasks = summary['total'] > 0
+    report_data = cached_report_data(user_id, start_date_str, end_date_str) if has_tasks else NO_TASKS_REPORT
     
     st.divider()
     
     # Show metrics
     st.subheader("📈 Overview")
-    show_attendance_metrics(report_data)
+    show_attendance_metrics(summary)
     
     st.divider()
     
@@ -361,17 +191,15 @@ def reports_page():
     st.subheader("📥 Export Report")
     
     if st.button("📊 Generate Excel Report"):
-        if report_data:
-            from database import get_user_attendance
-            
+        if not report_data.empty:
             user_name = get_current_user_name()
             
             # Get attendance data for the same date range
-            attendance_data = get_user_attendance(user_id, start_date, end_date)
+            attendance_data = cached_attendance_data(user_id, start_date_str, end_date_str)
             
             # Debug: Show what data we're getting
             st.write(f"**Debug Info:**")
-            st.write(f"- Task data records: {len(report_data) if report_data else 0}")
+            st.write(f"- Task data records: {len(report_data)}")
             st.write(f"- Attendance data records: {len(attendance_data) if attendance_data else 0}")
             
             if attendance_data:
@@ -387,7 +215,7 @@ def reports_page():
             
             st.download_button(
                 label="⬇️ Download Excel Report",
-                data=excel_file.getvalue(),
+                data=excel_file,
                 file_name=filename,
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
@@ -399,12 +227,14 @@ def reports_page():
     
     # Daily breakdown
     st.subheader("📋 Daily Breakdown")
-    show_daily_breakdown(report_data)
+    if has_tasks:
+        show_daily_breakdown(report_data)
+    else:
+        st.info("No tasks recorded for the selected date range.")
     
     # Raw data table
     if st.checkbox("Show Raw Data Table"):
-        if report_data:
-            df = pd.DataFrame(report_data)
-            st.dataframe(df, use_container_width=True)
+        if not report_data.empty:
+            st.dataframe(report_data, use_container_width=True)
         else:
             st.info("No data to display for the selected date range.") 
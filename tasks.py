@@ -1,8 +1,98 @@
+import threading
 import streamlit as st
-from datetime import datetime, date
-from database import (create_task, get_user_tasks, update_task_status, 
-                     update_task, delete_task, get_task_statistics)
+import pandas as pd
+from datetime import date, datetime
+from database import (create_task, get_user_tasks_filtered, update_task_statuses_bulk, 
+                     update_task, delete_tasks_bulk, get_task_statistics)
 from auth import get_current_user_id
+from reports import cached_report_data, cached_report_summary, PRIORITY_ICONS
+
+# Per-user task version, bumped on every task write. It is part of the task
+# list and statistics cache keys, so a write only invalidates that user's
+# entries. Kept process-wide rather than in session_state so the user's other
+# sessions pick up the change as well.
+_task_versions = {}
+_task_versions_lock = threading.Lock()
+
+# Task cards rendered per page of the task list
+TASKS_PER_PAGE = 20
+
+# Selectbox choices, with their positions for looking up a task's current value
+STATUS_OPTIONS = ("Pending", "In Progress", "Completed")
+PRIORITY_OPTIONS = ("Low", "Medium", "High")
+PRIORITY_INDEX = {priority: i for i, priority in enumerate(PRIORITY_OPTIONS)}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_task_statistics(user_id: int, version: int) -> dict:
+    """Get task statistics for a user, cached per task version."""
+    return get_task_statistics(user_id)
+
+def load_task_statistics(user_id: int) -> dict:
+    """Get the cached task statistics for the user's current version."""
+    return cached_task_statistics(user_id, _task_versions.get(user_id, 0))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_filtered_tasks(user_id: int, version: int, status: str, task_date: str,
+                          search: str, page: int) -> list:
+    """Get a page of the tasks matching the task page filters, cached per task version.
+    
+    Fetches one task past the page so the caller can tell whether a next page exists.
+    """
+    return get_user_tasks_filtered(user_id, status, task_date, search,
+                                   limit=TASKS_PER_PAGE + 1, offset=page * TASKS_PER_PAGE)
+
+def load_filtered_tasks(user_id: int, status_filter, search_term, date_filter,
+                        page: int) -> list:
+    """Get a page of the user's tasks matching the filter widget values."""
+    return cached_filtered_tasks(
+        user_id,
+        _task_versions.get(user_id, 0),
+        status_filter if status_filter != "All" else None,
+        date_filter.isoformat() if date_filter else None,
+        search_term or None,
+        page
+    )
+
+def set_task_page(page: int):
+    """Switch the task list to the given page."""
+    st.session_state.task_page = page
+
+def reset_task_table():
+    """Drop the unsaved edits and selection in the task table.
+    
+    A keyed data editor keeps its edits for as long as its key and columns stay
+    the same, so the table is reset by moving it to a new key.
+    """
+    st.session_state.task_table_generation = st.session_state.get("task_table_generation", 0) + 1
+
+def edit_selected_task(task_id: int):
+    """Open the edit form for the selected task."""
+    st.session_state.editing_task_id = task_id
+    reset_task_table()
+
+def close_task_editor():
+    """Close the edit form without saving."""
+    st.session_state.editing_task_id = None
+
+def clear_task_caches(user_id: int):
+    """Drop cached task lists, statistics and reports after a user's task changes."""
+    # Script threads of several sessions may bump the same user at once
+    with _task_versions_lock:
+        _task_versions[user_id] = _task_versions.get(user_id, 0) + 1
+    cached_report_data.clear()
+    cached_report_summary.clear()
+
+def task_values(title: str, description: str, task_date, priority: str,
+                category: str) -> tuple:
+    """Validate task form input and return it as (title, description, task_date,
+    priority, category), the order create_task, update_task and create_tasks_bulk take.
+    
+    Raises ValueError if the title is missing.
+    """
+    if not title:
+        raise ValueError("Task title is required")
+    return (title, description, task_date.isoformat() if task_date else None,
+            priority, category)
 
 def add_new_task():
     """Form to add a new task."""
@@ -13,7 +103,7 @@ def add_new_task():
         
         with col1:
             title = st.text_input("Task Title*")
-            priority = st.selectbox("Priority", ["Low", "Medium", "High"])
+            priority = st.selectbox("Priority", PRIORITY_OPTIONS)
             
         with col2:
             task_date = st.date_input("Task Date", value=datetime.now().date())
@@ -23,170 +113,155 @@ def add_new_task():
         submit = st.form_submit_button("Add Task")
         
         if submit:
-            if not title:
-                st.error("Task title is required")
+            try:
+                values = task_values(title, description, task_date, priority, category)
+            except ValueError as e:
+                st.error(str(e))
                 return
                 
             user_id = get_current_user_id()
-            task_date_str = task_date.isoformat() if task_date else None
-            
-            if create_task(user_id, title, description, task_date_str, priority, category):
+            if create_task(user_id, *values):
+                clear_task_caches(user_id)
                 st.success("Task added successfully!")
                 st.rerun()
             else:
                 st.error("Failed to add task")
 
-def display_task_card(task):
-    """Display a task in a card format."""
-    task_id, user_id, title, description, status, priority, category, task_date, created_at, completed_at = task
+def show_task_table(tasks: list) -> pd.DataFrame:
+    """Show a page of tasks as one table with editable status and selection columns.
     
-    # Color coding for priority and status
-    priority_colors = {"Low": "🟢", "Medium": "🟡", "High": "🔴"}
-    status_colors = {"Pending": "⏳", "In Progress": "🔄", "Completed": "✅"}
+    Returns the table as edited; rows stay in the order of tasks.
+    """
+    df = pd.DataFrame(tasks).set_index('id').drop(columns='user_id')
+    df['priority'] = df['priority'].map(PRIORITY_ICONS).fillna('⚪') + ' ' + df['priority']
+    df.insert(0, 'selected', False)
     
-    with st.container():
-        col1, col2, col3 = st.columns([3, 1, 1])
-        
-        with col1:
-            st.markdown(f"**{title}**")
-            if description:
-                st.caption(description)
-            
-            # Show task date
-            if task_date:
-                st.markdown(f"📅 Date: {task_date}")
-        
-        with col2:
-            st.markdown(f"{priority_colors.get(priority, '⚪')} {priority}")
-            st.caption(f"📂 {category}")
-            # Show status with icon
-            st.markdown(f"{status_colors.get(status, '⚪')} {status}")
-        
-        with col3:
-            # Status selector
-            status_options = ["Pending", "In Progress", "Completed"]
-            current_index = status_options.index(status) if status in status_options else 0
-            
-            new_status = st.selectbox(
-                "Change Status", 
-                status_options,
-                index=current_index,
-                key=f"status_{task_id}"
-            )
-            
-            if new_status != status:
-                if update_task_status(task_id, new_status):
-                    st.success("Status updated!")
-                    st.rerun()
-                else:
-                    st.error("Failed to update status")
-        
-        # Action buttons
-        col_edit, col_delete = st.columns(2)
-        with col_edit:
-            if st.button("Edit", key=f"edit_{task_id}"):
-                st.session_state[f"editing_{task_id}"] = True
-                st.rerun()
-        
-        with col_delete:
-            if st.button("Delete", key=f"delete_{task_id}"):
-                if delete_task(task_id):
-                    st.success("Task deleted!")
-                    st.rerun()
-                else:
-                    st.error("Failed to delete task")
-        
-        # Edit form (if editing)
-        if st.session_state.get(f"editing_{task_id}", False):
-            edit_task_form(task)
-        
-        st.divider()
+    # Edits are kept across reruns until reset_task_table moves the table to a new key
+    return st.data_editor(
+        df,
+        key=f"task_table_{st.session_state.get('task_table_generation', 0)}",
+        hide_index=True,
+        use_container_width=True,
+        column_order=("selected", "title", "description", "priority", "status",
+                      "category", "task_date"),
+        column_config={
+            "selected": st.column_config.CheckboxColumn("Select"),
+            "title": "Task",
+            "description": "Description",
+            "priority": "Priority",
+            "status": st.column_config.SelectboxColumn(
+                "Status", options=STATUS_OPTIONS, required=True
+            ),
+            "category": "📂 Category",
+            "task_date": "📅 Date",
+        },
+        disabled=("title", "description", "priority", "category", "task_date"),
+    )
+
+def show_task_actions(user_id: int, tasks: list, edited: pd.DataFrame):
+    """Show the buttons acting on the status changes and selection in the task table."""
+    status_changes = [
+        (task.id, status) for task, status in zip(tasks, edited['status'])
+        if status != task.status
+    ]
+    selected_ids = [task.id for task, selected in zip(tasks, edited['selected']) if selected]
+    
+    # Writes rerun the whole page so the statistics above pick them up
+    col_apply, col_discard, col_edit, col_delete = st.columns(4)
+    with col_apply:
+        if st.button(f"Apply {len(status_changes)} status change(s)", type="primary",
+                     disabled=not status_changes):
+            update_task_statuses_bulk(user_id, status_changes)
+            reset_task_table()
+            clear_task_caches(user_id)
+            st.success("Status updated!")
+            st.rerun()
+    with col_discard:
+        st.button("Discard changes", disabled=not status_changes,
+                  on_click=reset_task_table)
+    with col_edit:
+        # One task is edited at a time
+        st.button("Edit selected", disabled=len(selected_ids) != 1,
+                  on_click=edit_selected_task,
+                  args=(selected_ids[0] if selected_ids else None,))
+    with col_delete:
+        if st.button("Delete selected", disabled=not selected_ids):
+            delete_tasks_bulk(user_id, selected_ids)
+            reset_task_table()
+            clear_task_caches(user_id)
+            st.success("Task deleted!")
+            st.rerun()
+    
+    # Edit form for the task opened for editing, if it is on this page
+    editing_task_id = st.session_state.get("editing_task_id")
+    if editing_task_id is not None:
+        editing_task = next((task for task in tasks if task.id == editing_task_id), None)
+        if editing_task:
+            edit_task_form(editing_task)
 
 def edit_task_form(task):
     """Form to edit an existing task."""
-    task_id, user_id, title, description, status, priority, category, task_date, created_at, completed_at = task
-    
-    with st.form(f"edit_task_{task_id}"):
+    with st.form(f"edit_task_{task.id}"):
         st.subheader("Edit Task")
         
         col1, col2 = st.columns(2)
         with col1:
-            new_title = st.text_input("Title", value=title)
-            new_priority = st.selectbox("Priority", ["Low", "Medium", "High"], 
-                                      index=["Low", "Medium", "High"].index(priority))
+            new_title = st.text_input("Title", value=task.title)
+            new_priority = st.selectbox("Priority", PRIORITY_OPTIONS, 
+                                      index=PRIORITY_INDEX.get(task.priority, 1))
         
         with col2:
-            current_task_date = datetime.fromisoformat(task_date).date() if task_date else None
+            current_task_date = date.fromisoformat(task.task_date) if task.task_date else None
             new_task_date = st.date_input("Task Date", value=current_task_date)
-            new_category = st.text_input("Category", value=category)
+            new_category = st.text_input("Category", value=task.category)
         
-        new_description = st.text_area("Description", value=description or "")
+        new_description = st.text_area("Description", value=task.description or "")
         
         col_save, col_cancel = st.columns(2)
         with col_save:
             save = st.form_submit_button("Save Changes")
         with col_cancel:
-            cancel = st.form_submit_button("Cancel")
+            st.form_submit_button("Cancel", on_click=close_task_editor)
         
         if save:
-            new_task_date_str = new_task_date.isoformat() if new_task_date else None
-            if update_task(task_id, new_title, new_description, new_task_date_str, 
-                          new_priority, new_category):
+            try:
+                values = task_values(new_title, new_description, new_task_date,
+                                     new_priority, new_category)
+            except ValueError as e:
+                st.error(str(e))
+                return
+            
+            if update_task(task.id, *values):
+                clear_task_caches(task.user_id)
                 st.success("Task updated successfully!")
-                st.session_state[f"editing_{task_id}"] = False
+                st.session_state.editing_task_id = None
                 st.rerun()
             else:
                 st.error("Failed to update task")
-        
-        if cancel:
-            st.session_state[f"editing_{task_id}"] = False
-            st.rerun()
 
 def show_task_filters():
-    """Show task filtering options."""
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        status_filter = st.selectbox(
-            "Filter by Status", 
-            ["All", "Pending", "In Progress", "Completed"],
-            key="status_filter"
-        )
-    
-    with col2:
-        search_term = st.text_input("Search tasks", key="search_term")
-    
-    with col3:
-        date_filter = st.date_input("Filter by Date", value=None, key="date_filter")
+    """Show task filtering options; changes apply together on submit."""
+    with st.form("filters_form"):
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            status_filter = st.selectbox(
+                "Filter by Status", 
+                ("All",) + STATUS_OPTIONS,
+                key="status_filter"
+            )
+        
+        with col2:
+            search_term = st.text_input("Search tasks", key="search_term")
+        
+        with col3:
+            date_filter = st.date_input("Filter by Date", value=None, key="date_filter")
+        
+        # New filters start again from the first page
+        st.form_submit_button("Apply filters", on_click=set_task_page, args=(0,))
     
     return status_filter, search_term, date_filter
 
-def filter_tasks(tasks, status_filter, search_term, date_filter):
-    """Filter tasks based on criteria."""
-    filtered_tasks = tasks
-    
-    # Filter by status
-    if status_filter != "All":
-        filtered_tasks = [task for task in filtered_tasks if task[4] == status_filter]
-    
-    # Filter by search term
-    if search_term:
-        filtered_tasks = [
-            task for task in filtered_tasks 
-            if search_term.lower() in task[2].lower() or 
-               (task[3] and search_term.lower() in task[3].lower())
-        ]
-    
-    # Filter by date
-    if date_filter:
-        date_str = date_filter.isoformat()
-        filtered_tasks = [
-            task for task in filtered_tasks 
-            if task[7] and task[7] == date_str
-        ]
-    
-    return filtered_tasks
-
 def tasks_page():
     """Main tasks page."""
     user_id = get_current_user_id()
@@ -197,7 +272,7 @@ def tasks_page():
     st.title("📋 Task Manager")
     
     # Task statistics
-    stats = get_task_statistics(user_id)
+    stats = load_task_statistics(user_id)
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
@@ -219,15 +294,41 @@ def tasks_page():
     # Task filters
     st.subheader("📊 Your Tasks")
     status_filter, search_term, date_filter = show_task_filters()
+    show_task_list(user_id, status_filter, search_term, date_filter)
+
+@st.fragment
+def show_task_list(user_id: int, status_filter, search_term, date_filter):
+    """Show a page of the filtered tasks.
     
-    # Get and filter tasks
-    all_tasks = get_user_tasks(user_id)
-    filtered_tasks = filter_tasks(all_tasks, status_filter, search_term, date_filter)
+    Runs as a fragment, so edits, selection and paging in the task table rerun
+    only this part of the page.
+    """
+    # Filter tasks, one page at a time
+    page = st.session_state.setdefault("task_page", 0)
+    filtered_tasks = load_filtered_tasks(user_id, status_filter, search_term, date_filter, page)
+    
+    if not filtered_tasks and page > 0:
+        # The last tasks on this page were deleted or changed status
+        set_task_page(page - 1)
+        st.rerun()
     
     if not filtered_tasks:
         st.info("No tasks found matching your criteria.")
         return
     
     # Display tasks
-    for task in filtered_tasks:
-        display_task_card(task) 
+    page_tasks = filtered_tasks[:TASKS_PER_PAGE]
+    edited = show_task_table(page_tasks)
+    show_task_actions(user_id, page_tasks, edited)
+    
+    has_next = len(filtered_tasks) > TASKS_PER_PAGE
+    if page > 0 or has_next:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            st.button("← Previous", disabled=page == 0,
+                      on_click=set_task_page, args=(page - 1,))
+        with col_page:
+            st.caption(f"Page {page + 1}")
+        with col_next:
+            st.button("Next →", disabled=not has_next,
+                      on_click=set_task_page, args=(page + 1,))